@@ -0,0 +1,168 @@
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_DIR = os.path.join(ROOT_DIR, "snowflake-ingest")
+
+# 🔧 Startup budget: argument parsing must stay well clear of the heavy imports below
+STARTUP_BUDGET_SECONDS = 0.25
+HEAVY_MODULES = ["snowflake.snowpark", "matplotlib", "yfinance", "plotly", "streamlit", "pandas", "pyarrow"]
+MODES = ["positive", "negative", "random"]
+FORMATS = ["parquet", "arrow", "csv"]
+
+def _use_pipeline_modules():
+    # snowflake-ingest has its own config.py, which must shadow the dashboard's for these commands
+    if PIPELINE_DIR not in sys.path:
+        sys.path.insert(0, PIPELINE_DIR)
+
+def cmd_ingest(args):
+    _use_pipeline_modules()
+    from ingest_scheduler import run_schedule
+    from session_pool import get_pool
+
+    try:
+        run_schedule(args.symbols, open_positions=args.open_positions, refresh_hours=args.refresh_hours)
+    finally:
+        get_pool().close_all()
+
+def cmd_features(args):
+    _use_pipeline_modules()
+    from run_pipeline import stage_features
+    from session_pool import get_pool
+
+    pool = get_pool()
+    try:
+        with pool.session() as session:
+            stage_features(session, args.sentiment_mode)
+    finally:
+        pool.close_all()
+
+def cmd_backtest(args):
+    _use_pipeline_modules()
+    from run_pipeline import stage_backtest
+    from session_pool import get_pool
+
+    pool = get_pool()
+    try:
+        with pool.session() as session:
+            stage_backtest(session, args.sentiment_mode)
+    finally:
+        pool.close_all()
+
+def cmd_sweep(args):
+    _use_pipeline_modules()
+    from backtest_strategy import fetch_feature_set
+    from sweep_strategy import run_sweep, export_sweep, SWEEP_MODES
+    from session_pool import get_pool
+
+    pool = get_pool()
+    try:
+        with pool.session() as session:
+            features, _ = fetch_feature_set(session, sentiment_mode=None)
+    finally:
+        pool.close_all()
+    export_sweep(run_sweep(features, modes=args.modes or SWEEP_MODES), args.format)
+
+def cmd_explain(args):
+    _use_pipeline_modules()
+    import explain_strategy
+    from session_pool import get_pool
+
+    pool = get_pool()
+    try:
+        with pool.session() as session:
+            features, trades = explain_strategy.fetch_data(session)
+    finally:
+        pool.close_all()
+    explain_strategy.summarize(features, trades)
+    explain_strategy.narrate(features, trades)
+    if not args.no_plots:
+        explain_strategy.plot_thresholds(features)
+    explain_strategy.export_dashboard_data(features, trades, mode=args.mode, fmt=args.format)
+
+def cmd_compare(args):
+    _use_pipeline_modules()
+    from compare_modes import compare_modes
+
+    compare_modes(args.format)
+
+def cmd_pipeline(args):
+    _use_pipeline_modules()
+    from run_pipeline import run_pipeline
+
+    run_pipeline(args.symbols, args.sentiment_mode, args.skip_ingest, args.open_positions)
+
+def cmd_dashboard(args):
+    import subprocess
+
+    command = [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT_DIR, "app.py")]
+    return subprocess.call(command + args.streamlit_args)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="market-signal", description="Market signal pipeline and dashboard")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="report CLI startup time and any heavy modules loaded before dispatch")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="quota-aware stock and news ingest for a symbol universe")
+    p.add_argument("symbols", nargs="+")
+    p.add_argument("--open-positions", nargs="*", default=[])
+    p.add_argument("--refresh-hours", type=float, default=20)
+    p.set_defaults(handler=cmd_ingest)
+
+    p = sub.add_parser("features", help="join stock and news into FEATURE_SET")
+    p.add_argument("--sentiment-mode", default="random", choices=MODES)
+    p.set_defaults(handler=cmd_features)
+
+    p = sub.add_parser("backtest", help="simulate the strategy on FEATURE_SET")
+    p.add_argument("--sentiment-mode", choices=MODES, help="defaults to backtest_strategy.SENTIMENT_MODE")
+    p.set_defaults(handler=cmd_backtest)
+
+    p = sub.add_parser("sweep", help="backtest a grid of strategy parameters")
+    p.add_argument("--modes", nargs="*", choices=MODES)
+    p.add_argument("--format", choices=FORMATS)
+    p.set_defaults(handler=cmd_sweep)
+
+    p = sub.add_parser("explain", help="summarize, narrate, plot and export the latest backtest")
+    p.add_argument("--mode", choices=MODES, help="sentiment mode the backtest ran with; names the trades export")
+    p.add_argument("--format", choices=FORMATS)
+    p.add_argument("--no-plots", action="store_true")
+    p.set_defaults(handler=cmd_explain)
+
+    p = sub.add_parser("compare", help="compare trade exports across sentiment modes")
+    p.add_argument("--format", choices=FORMATS)
+    p.set_defaults(handler=cmd_compare)
+
+    p = sub.add_parser("pipeline", help="run ingest → features → backtest → explain on shared sessions")
+    p.add_argument("--symbols", nargs="+", default=["IBM"])
+    p.add_argument("--open-positions", nargs="*", default=[])
+    p.add_argument("--sentiment-mode", default="random", choices=MODES)
+    p.add_argument("--skip-ingest", action="store_true")
+    p.set_defaults(handler=cmd_pipeline)
+
+    p = sub.add_parser("dashboard", help="launch the Streamlit dashboard")
+    p.add_argument("streamlit_args", nargs=argparse.REMAINDER)
+    p.set_defaults(handler=cmd_dashboard)
+    return parser
+
+def startup_report():
+    elapsed = time.perf_counter() - _STARTED
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    status = "✅" if elapsed <= STARTUP_BUDGET_SECONDS and not loaded else "⚠️"
+    print(f"{status} CLI ready in {elapsed * 1000:.1f} ms (budget {STARTUP_BUDGET_SECONDS * 1000:.0f} ms)")
+    if loaded:
+        print(f"⚠️ Heavy modules loaded before dispatch: {', '.join(loaded)}")
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.startup_report:
+        startup_report()
+    return args.handler(args) or 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,8 @@ THRESHOLDS = {
     "sentiment_sell": -0.05  # -5%
 }
 
+VOLATILITY_EXIT = 0.02  # exit once price moves 2% from entry
+
 
 PERIGON_KEY = "50bb9387-f134-45c2-ac40-613dff390ad9"
 FINNHUB_KEY = "d3h340pr01qpep68u620d3h340pr01qpep68u62g"
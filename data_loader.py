@@ -1,8 +1,14 @@
 import pandas as pd
 import yfinance as yf
+import transport
 
 def fetch_price_data(symbol, start_date, end_date):
-    df = yf.download(symbol, start=start_date, end=end_date, auto_adjust=False)
+    # yfinance manages its own HTTP session, so record/replay wraps the parsed result
+    df = transport.cached_call(
+        "yfinance",
+        {"symbol": symbol, "start": start_date, "end": end_date, "auto_adjust": False},
+        lambda: yf.download(symbol, start=start_date, end=end_date, auto_adjust=False),
+    )
     df = df.rename(columns={"Open": "open", "Close": "close"})
     df = df[["open", "close"]]
     df.index = pd.to_datetime(df.index)
@@ -1,10 +1,18 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+import time
 from datetime import datetime, timedelta
-from config import COMPANY_NAMES
+from config import COMPANY_NAMES, THRESHOLDS, VOLATILITY_EXIT
 from data_loader import fetch_price_data
-from trade_logic import generate_trades
+from trade_logic import build_entry_index, simulate_from_index
+
+@st.cache_resource(show_spinner="Fetching prices and sentiment…", max_entries=8)
+def load_entry_index(symbol, start_date, end_date):
+    # Cached as a resource so slider reruns reuse the arrays without copying or refetching;
+    # max_entries bounds memory as users browse symbols and date ranges
+    price_df = fetch_price_data(symbol, start_date, end_date)
+    return build_entry_index(symbol, price_df)
 
 st.title("📊 Strategy Dashboard – Modular Cockpit")
 symbols = list(COMPANY_NAMES.keys())
@@ -17,19 +25,27 @@ start_date = pd.to_datetime(start_date)
 end_date = pd.to_datetime(end_date)
 
 st.sidebar.markdown("### Signal Thresholds")
-st.sidebar.write("📈 Momentum: > 0.5% = BUY, < –0.5% = SELL")
-st.sidebar.write("🧠 Sentiment: > 5% = BUY, < –5% = SELL")
+thresholds = {
+    "momentum_buy": st.sidebar.slider("📈 Momentum BUY above (%)", 0.0, 5.0, THRESHOLDS["momentum_buy"] * 100, 0.1) / 100,
+    "momentum_sell": st.sidebar.slider("📉 Momentum SELL below (%)", -5.0, 0.0, THRESHOLDS["momentum_sell"] * 100, 0.1) / 100,
+    "sentiment_buy": st.sidebar.slider("🧠 Sentiment BUY from (%)", 0, 100, int(THRESHOLDS["sentiment_buy"] * 100), 5) / 100,
+    "sentiment_sell": st.sidebar.slider("🧠 Sentiment SELL from (%)", -100, 0, int(THRESHOLDS["sentiment_sell"] * 100), 5) / 100,
+}
+volatility_exit = st.sidebar.slider("⚡ Volatility exit (%)", 0.5, 10.0, VOLATILITY_EXIT * 100, 0.5) / 100
 
-price_df = fetch_price_data(selected_symbol, start_date, end_date)
-df = generate_trades(selected_symbol, COMPANY_NAMES[selected_symbol], price_df)
+entry_index = load_entry_index(selected_symbol, start_date, end_date)
+recompute_start = time.perf_counter()
+ledger = simulate_from_index(entry_index, thresholds, volatility_exit)
+st.sidebar.caption(f"Recomputed {len(ledger)} trades in {(time.perf_counter() - recompute_start) * 1000:.1f} ms")
+df = ledger.to_pandas()
 
 st.subheader(f"📌 Summary Metrics for {selected_symbol}")
-st.metric("Total Trades", len(df))
-st.metric("Net PnL", f"${df['pnl'].sum():.2f}" if not df.empty else "N/A")
+st.metric("Total Trades", len(ledger))
+st.metric("Net PnL", f"${ledger.net_pnl:.2f}" if len(ledger) else "N/A")
 
-if not df.empty:
-    st.metric("Avg Holding Duration", f"{df['holding_days'].mean():.2f} days")
-    st.metric("Latest Signal", df["final_signal"].iloc[-1])
+if len(ledger):
+    st.metric("Avg Holding Duration", f"{ledger.avg_hold:.2f} days")
+    st.metric("Latest Signal", ledger.last("final_signal"))
 else:
     st.metric("Avg Holding Duration", "N/A")
     st.metric("Latest Signal", "N/A")
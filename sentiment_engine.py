@@ -1,4 +1,4 @@
-import requests
+import transport
 import pandas as pd
 import re
 from config import COMPANY_NAMES, FINNHUB_KEY
@@ -38,7 +38,7 @@ def fetch_articles(symbol, entry_date):
     url = f"https://finnhub.io/api/v1/company-news?symbol={symbol}&from={from_date}&to={to_date}&token={FINNHUB_KEY}"
 
     try:
-        response = requests.get(url, timeout=10)
+        response = transport.get(url, timeout=10)
         articles = response.json()
         for article in articles:
             title = article.get("headline", "")
@@ -56,6 +56,8 @@ def fetch_articles(symbol, entry_date):
         ARTICLE_CACHE[cache_key] = (0.0, "No relevant article found", "https://www.marketwatch.com")
         print("[NO MATCH] No relevant article found")
         return ARTICLE_CACHE[cache_key]
+    except transport.ReplayMiss:
+        raise  # a missing recording must fail the replay, not read as neutral sentiment
     except Exception as e:
         ARTICLE_CACHE[cache_key] = (0.0, "Finnhub fetch failed", "https://www.marketwatch.com")
         print(f"[ERROR] Finnhub fetch failed: {e}")
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modules shared with the dashboard (trade_ledger, transport) live at the repo root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
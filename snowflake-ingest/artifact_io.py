@@ -0,0 +1,108 @@
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pandas as pd
+import json
+import os
+
+# 🔧 Export settings: "parquet" (default), "arrow" (uncompressed IPC, memory-mappable) or "csv"
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "parquet")
+PARQUET_COMPRESSION = "zstd"
+METADATA_KEY = b"run_metadata"
+
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+_CATEGORY = pa.dictionary(pa.int16(), pa.string())
+
+ARTIFACT_SCHEMAS = {
+    "trades": pa.schema([
+        ("entry_date", pa.timestamp("ns")),
+        ("date", pa.timestamp("ns")),
+        ("entry", pa.float64()),
+        ("exit", pa.float64()),
+        ("pnl", pa.float64()),
+        ("capital", pa.float64()),
+        ("holding_days", pa.int32()),
+        ("signal", _CATEGORY),
+        ("confidence", pa.float64()),
+        ("trigger_type", _CATEGORY),
+        ("entry_signal_strength", pa.float64()),
+    ]),
+    "summary": pa.schema([
+        ("mode", pa.string()),
+        ("trades", pa.int32()),
+        ("total_pnl", pa.float64()),
+        ("avg_hold", pa.float64()),
+    ]),
+    "trigger_distribution": pa.schema([("trigger_type", pa.string()), ("count", pa.int32())]),
+    "trigger_pnl": pa.schema([("trigger_type", pa.string()), ("total_pnl", pa.float64())]),
+}
+
+def _to_table(df, schema_name=None, metadata=None):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    explicit = ARTIFACT_SCHEMAS.get(schema_name)
+    if explicit is not None:
+        # Known columns get their declared types; anything extra keeps its inferred type
+        target = pa.schema([
+            explicit.field(name) if name in explicit.names else table.schema.field(name)
+            for name in table.column_names
+        ])
+        table = table.cast(target)
+
+    run_metadata = {"generated_at": datetime.utcnow().isoformat(), **(metadata or {})}
+    return table.replace_schema_metadata({METADATA_KEY: json.dumps(run_metadata, default=str).encode()})
+
+def write_artifact(df, name, schema_name=None, metadata=None, fmt=None, out_dir="."):
+    fmt = fmt or EXPORT_FORMAT
+    path = os.path.join(out_dir, name + EXTENSIONS[fmt])
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        table = _to_table(df, schema_name, metadata)
+        if fmt == "parquet":
+            pq.write_table(table, path, compression=PARQUET_COMPRESSION)
+        else:
+            with pa.OSFile(path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+    return path
+
+def find_artifact(name, in_dir="."):
+    # Exports in different formats can coexist after EXPORT_FORMAT changes; the newest one wins
+    candidates = [
+        (os.path.getmtime(path), path, fmt)
+        for fmt, path in ((fmt, os.path.join(in_dir, name + ext)) for fmt, ext in EXTENSIONS.items())
+        if os.path.exists(path)
+    ]
+    if not candidates:
+        raise FileNotFoundError(f"No artifact named {name} in {in_dir}")
+    _, path, fmt = max(candidates)
+    return path, fmt
+
+def read_artifact(name, columns=None, in_dir="."):
+    """Load an exported artifact, reading only the requested columns; columnar files are memory-mapped."""
+    path, fmt = find_artifact(name, in_dir)
+    if fmt == "parquet":
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    if fmt == "arrow":
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+            return (table.select(columns) if columns else table).to_pandas()
+
+    # CSV carries no types, so re-apply the declared date columns
+    df = pd.read_csv(path, usecols=columns)
+    for column in ("date", "entry_date", "exit_date"):
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    return df
+
+def read_metadata(name, in_dir="."):
+    path, fmt = find_artifact(name, in_dir)
+    if fmt == "parquet":
+        metadata = pq.read_schema(path).metadata
+    elif fmt == "arrow":
+        with pa.memory_map(path, "r") as source:
+            metadata = pa.ipc.open_file(source).schema.metadata
+    else:
+        return {}
+    return json.loads(metadata[METADATA_KEY]) if metadata and METADATA_KEY in metadata else {}
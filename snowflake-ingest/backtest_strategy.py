@@ -1,9 +1,13 @@
 from config import get_snowflake_session
+from snapshot_cache import read_table
+from frame_schema import apply_schema, prepare_for_write
 from datetime import datetime
 from dotenv import load_dotenv
 import pandas as pd
 import numpy as np
 import re
+import _paths  # noqa: F401  (puts the repo root on sys.path)
+from trade_ledger import TradeLedger, BACKTEST_SCHEMA
 
 load_dotenv()
 
@@ -14,29 +18,35 @@ FALLBACK_SELL_THRESHOLD = -1.2  # price drop multiplier
 MOMENTUM_BUY_THRESHOLD = 1.5    # strong upward delta
 MOMENTUM_SELL_THRESHOLD = -1.5  # strong downward delta
 
-def fetch_feature_set():
-    session = get_snowflake_session()
+def fetch_feature_set(session=None, sentiment_mode=SENTIMENT_MODE):
+    session = session or get_snowflake_session()
     session.use_schema("RAW")
 
-    df = session.table("FEATURE_SET").to_pandas()
+    df = apply_schema(read_table(session, "FEATURE_SET"), "FEATURE_SET", stage="backtest load")
     df["date"] = pd.to_datetime(df["date"])
     df.sort_values("date", inplace=True)
 
+    df = apply_sentiment_mode(df, sentiment_mode)
+    return df, session
+
+def apply_sentiment_mode(df, mode=SENTIMENT_MODE):
     # Inject synthetic sentiment
-    if SENTIMENT_MODE == "positive":
+    if mode == "positive":
         df["sentiment_score"] = 1
-    elif SENTIMENT_MODE == "negative":
+    elif mode == "negative":
         df["sentiment_score"] = -1
-    elif SENTIMENT_MODE == "random":
+    elif mode == "random":
         df["sentiment_score"] = np.random.choice([-1, 0, 1], size=len(df))
 
     df["sentiment_threshold"] = df["sentiment_score"].rolling(window=10, min_periods=1).mean()
     df["price_threshold"] = df["price_delta"].rolling(window=10, min_periods=1).mean()
-    return df, session
+    return df
 
-def simulate_strategy(df):
-    trades = []
-    capital = 100000
+def simulate_ledger(df, min_signal_strength=MIN_SIGNAL_STRENGTH, fallback_sell_threshold=FALLBACK_SELL_THRESHOLD,
+                    momentum_buy_threshold=MOMENTUM_BUY_THRESHOLD, momentum_sell_threshold=MOMENTUM_SELL_THRESHOLD,
+                    verbose=True):
+    trades = TradeLedger(BACKTEST_SCHEMA, group_col="trigger_type", starting_capital=100000,
+                         capacity=max(len(df) // 4, 1))
     position = 0
     entry_date = None
     trigger_type = None
@@ -53,7 +63,7 @@ def simulate_strategy(df):
         confidence = 0
         signal_strength = round(row["price_delta"] / row["price_threshold"], 2)
 
-        if signal_strength < MIN_SIGNAL_STRENGTH:
+        if signal_strength < min_signal_strength:
             continue  # suppress weak entries
 
         # BUY logic
@@ -64,7 +74,8 @@ def simulate_strategy(df):
             entry_date = row["date"]
             confidence = (row["sentiment_score"] - row["sentiment_threshold"]) + (row["price_delta"] - row["price_threshold"])
             primary_triggered += 1
-            print(f"📌 BUY triggered on {row['date'].date()} via PRIMARY")
+            if verbose:
+                print(f"📌 BUY triggered on {row['date'].date()} via PRIMARY")
 
         elif row["sentiment_score"] >= 0 and row["price_delta"] >= 0.8 * row["price_threshold"]:
             signal = "BUY"
@@ -73,58 +84,62 @@ def simulate_strategy(df):
             entry_date = row["date"]
             confidence = (row["price_delta"] / row["price_threshold"]) * 0.5
             fallback_triggered += 1
-            print(f"📌 BUY triggered on {row['date'].date()} via FALLBACK")
+            if verbose:
+                print(f"📌 BUY triggered on {row['date'].date()} via FALLBACK")
 
-        elif row["price_delta"] >= MOMENTUM_BUY_THRESHOLD * row["price_threshold"]:
+        elif row["price_delta"] >= momentum_buy_threshold * row["price_threshold"]:
             signal = "BUY"
             trigger_type = "momentum"
             position = row["close"]
             entry_date = row["date"]
             confidence = row["price_delta"]
             momentum_buy_triggered += 1
-            print(f"📌 BUY triggered on {row['date'].date()} via MOMENTUM")
+            if verbose:
+                print(f"📌 BUY triggered on {row['date'].date()} via MOMENTUM")
 
         # SELL logic
         elif row["sentiment_score"] < 0 and row["price_trend"] == "down":
             signal = "SELL"
 
-        elif row["price_delta"] < FALLBACK_SELL_THRESHOLD * row["price_threshold"]:
+        elif row["price_delta"] < fallback_sell_threshold * row["price_threshold"]:
             signal = "SELL (fallback)"
             fallback_sell_triggered += 1
 
-        elif row["price_delta"] < MOMENTUM_SELL_THRESHOLD * row["price_threshold"]:
+        elif row["price_delta"] < momentum_sell_threshold * row["price_threshold"]:
             signal = "SELL (momentum)"
             momentum_sell_triggered += 1
 
         if signal and "SELL" in signal and position:
             pnl = row["close"] - position
             holding_days = (row["date"] - entry_date).days
-            capital += pnl
-            trades.append({
-                "entry_date": entry_date,
-                "date": row["date"],
-                "entry": position,
-                "exit": row["close"],
-                "pnl": pnl,
-                "capital": capital,
-                "holding_days": holding_days,
-                "signal": signal,
-                "confidence": round(confidence, 2),
-                "trigger_type": trigger_type,
-                "entry_signal_strength": signal_strength
-            })
+            trades.append(
+                entry_date=entry_date,
+                date=row["date"],
+                entry=position,
+                exit=row["close"],
+                pnl=pnl,
+                holding_days=holding_days,
+                signal=signal,
+                confidence=round(confidence, 2),
+                trigger_type=trigger_type,
+                entry_signal_strength=signal_strength
+            )  # capital column is filled from the ledger's running capital
             position = 0
             entry_date = None
             trigger_type = None
             signal_strength = 0
 
-    print(f"\n📊 Primary triggers used: {primary_triggered}")
-    print(f"📊 Fallback triggers used: {fallback_triggered}")
-    print(f"📊 Momentum BUYs used: {momentum_buy_triggered}")
-    print(f"📊 Fallback SELLs used: {fallback_sell_triggered}")
-    print(f"📊 Momentum SELLs used: {momentum_sell_triggered}")
-    print(f"📊 Trades executed: {len(trades)}")
-    return pd.DataFrame(trades)
+    if verbose:
+        print(f"\n📊 Primary triggers used: {primary_triggered}")
+        print(f"📊 Fallback triggers used: {fallback_triggered}")
+        print(f"📊 Momentum BUYs used: {momentum_buy_triggered}")
+        print(f"📊 Fallback SELLs used: {fallback_sell_triggered}")
+        print(f"📊 Momentum SELLs used: {momentum_sell_triggered}")
+        print(f"📊 Trades executed: {len(trades)}")
+    return trades
+
+def simulate_strategy(df):
+    return simulate_ledger(df).to_pandas()
 
 def sanitize(name):
     name = str(name).strip().lower()
@@ -141,7 +156,7 @@ def write_backtest_results(session, df, table_name="BACKTEST_RESULTS"):
     df.columns = [sanitize(col) for col in df.columns]
     df.reset_index(drop=True, inplace=True)
 
-    snow_df = session.create_dataframe(df)
+    snow_df = session.create_dataframe(prepare_for_write(df, "BACKTEST_RESULTS"))
     snow_df.write.mode("overwrite").save_as_table(table_name)
 
     print(f"✅ {len(df)} trades written to RAW.{table_name}")
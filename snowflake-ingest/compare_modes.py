@@ -1,9 +1,15 @@
+from report_render import render_figures, line_series, scatter_series
+from artifact_io import read_artifact, write_artifact
 import pandas as pd
-import matplotlib.pyplot as plt
+import _paths  # noqa: F401  (puts the repo root on sys.path)
+from trade_ledger import TradeLedger, BACKTEST_SCHEMA
+
+# Only the columns the summary and plots use are read from each export
+TRADE_COLUMNS = ["date", "pnl", "holding_days", "trigger_type", "entry_signal_strength"]
 
 def load_trades(mode):
     try:
-        return pd.read_csv(f"trades_dashboard_{mode}.csv")
+        return read_artifact(f"trades_dashboard_{mode}", columns=TRADE_COLUMNS)
     except FileNotFoundError:
         print(f"⚠️ No trades found for mode: {mode}")
         return pd.DataFrame()
@@ -16,71 +22,67 @@ def summarize_trades(df, mode):
             "total_pnl": 0,
             "avg_hold": 0
         }
-    return {
-        "mode": mode,
-        "trades": len(df),
-        "total_pnl": round(df["pnl"].sum(), 2),
-        "avg_hold": round(df["holding_days"].mean(), 2)
-    }
+    return {"mode": mode, **TradeLedger.from_frame(df, BACKTEST_SCHEMA).summary()}
 
 def plot_trade_density(trade_data):
-    plt.figure(figsize=(12, 6))
+    series = []
     for mode, df in trade_data.items():
         if df.empty:
             continue
         df["date"] = pd.to_datetime(df["date"])
         density = df["date"].dt.to_period("M").value_counts().sort_index()
-        plt.plot(density.index.to_timestamp(), density.values, label=mode.capitalize())
+        series.append(line_series(density.index.to_timestamp().to_numpy(), density.values, mode.capitalize()))
 
-    plt.title("Trade Density Over Time")
-    plt.xlabel("Date")
-    plt.ylabel("Number of Trades")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig("trade_density.png")
-    plt.close()
+    return {
+        "filename": "trade_density.png",
+        "title": "Trade Density Over Time",
+        "xlabel": "Date",
+        "ylabel": "Number of Trades",
+        "series": series,
+    }
 
 def plot_trigger_distribution(trade_data):
     trigger_counts = {}
     for mode, df in trade_data.items():
         if df.empty:
             continue
-        counts = df["trigger_type"].value_counts()
-        trigger_counts[mode] = counts
+        trigger_counts[mode] = pd.Series(TradeLedger.from_frame(df, BACKTEST_SCHEMA).group_counts())
 
     trigger_df = pd.DataFrame(trigger_counts).fillna(0).astype(int)
-    trigger_df.plot(kind="bar", figsize=(10, 6))
-    plt.title("Trigger Type Distribution Across Modes")
-    plt.xlabel("Trigger Type")
-    plt.ylabel("Count")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig("trigger_distribution.png")
-    plt.close()
+    return {
+        "filename": "trigger_distribution.png",
+        "kind": "bar",
+        "figsize": (10, 6),
+        "title": "Trigger Type Distribution Across Modes",
+        "xlabel": "Trigger Type",
+        "ylabel": "Count",
+        "categories": [str(c) for c in trigger_df.index],
+        "series": [{"y": trigger_df[mode].to_numpy(), "label": mode} for mode in trigger_df.columns],
+    }
 
 def plot_signal_vs_pnl(trade_data):
-    plt.figure(figsize=(12, 6))
+    series = []
     for mode, df in trade_data.items():
         if df.empty:
             continue
-        plt.scatter(df["entry_signal_strength"], df["pnl"], label=mode.capitalize(), alpha=0.7)
-
-    plt.axhline(0, color="gray", linestyle="--")
-    plt.title("Signal Strength vs P&L")
-    plt.xlabel("Entry Signal Strength")
-    plt.ylabel("P&L")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig("signal_vs_pnl.png")
-    plt.close()
-
-def export_summary(summary_df):
-    summary_df.to_csv("mode_comparison_summary.csv", index=False)
-    print("📁 Summary exported to mode_comparison_summary.csv")
-
-def compare_modes():
+        series.append(scatter_series(df["entry_signal_strength"], df["pnl"], mode.capitalize(), alpha=0.7))
+
+    return {
+        "filename": "signal_vs_pnl.png",
+        "kind": "scatter",
+        "title": "Signal Strength vs P&L",
+        "xlabel": "Entry Signal Strength",
+        "ylabel": "P&L",
+        "axhline": 0,
+        "series": series,
+    }
+
+def export_summary(summary_df, fmt=None):
+    path = write_artifact(summary_df, "mode_comparison_summary", "summary",
+                          {"modes": summary_df["mode"].tolist()}, fmt)
+    print(f"📁 Summary exported to {path}")
+
+def compare_modes(fmt=None):
     modes = ["positive", "random", "negative"]
     trade_data = {mode: load_trades(mode) for mode in modes}
     summaries = [summarize_trades(df, mode) for mode, df in trade_data.items()]
@@ -89,11 +91,17 @@ def compare_modes():
     print("\n📋 Comparative Summary:")
     print(summary_df.to_string(index=False))
 
-    plot_trade_density(trade_data)
-    plot_trigger_distribution(trade_data)
-    plot_signal_vs_pnl(trade_data)
-    export_summary(summary_df)
+    render_figures([
+        plot_trade_density(trade_data),
+        plot_trigger_distribution(trade_data),
+        plot_signal_vs_pnl(trade_data),
+    ])
+    export_summary(summary_df, fmt)
 
 if __name__ == "__main__":
-    compare_modes()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare backtest exports across sentiment modes")
+    parser.add_argument("--format", choices=["parquet", "arrow", "csv"], help="summary format (default: parquet)")
+    compare_modes(parser.parse_args().format)
 
@@ -12,8 +12,8 @@ def get_snowflake_session():
         "role": os.getenv("SNOWFLAKE_ROLE"),
         "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
         "database": os.getenv("SNOWFLAKE_DATABASE"),
-        "schema": os.getenv("SNOWFLAKE_SCHEMA")
+        "schema": os.getenv("SNOWFLAKE_SCHEMA"),
+        "client_session_keep_alive": True  # stop idle pooled sessions from expiring
     }
 
     return Session.builder.configs(connection_parameters).create()
-
@@ -5,22 +5,27 @@ import pandas as pd
 import numpy as np
 import re
 
+from dedup_news import collapse_duplicates
+from frame_schema import apply_schema, prepare_for_write
+
 load_dotenv()
 
-def fetch_dataframes():
-    session = get_snowflake_session()
+def fetch_dataframes(session=None):
+    session = session or get_snowflake_session()
     session.use_schema("RAW")
 
-    stock_df = session.table("STOCK_DATA").to_pandas()
-    news_df = session.table("NEWS_RAW").to_pandas()
+    stock_df = apply_schema(session.table("STOCK_DATA").to_pandas(), "STOCK_DATA", stage="load STOCK_DATA")
+    news_df = apply_schema(session.table("NEWS_RAW").to_pandas(), "NEWS_RAW", stage="load NEWS_RAW")
 
-    stock_df["date"] = pd.to_datetime(stock_df["date"]).dt.date
-    news_df["published_at"] = pd.to_datetime(news_df["published_at"]).dt.date
+    stock_df["date"] = stock_df["date"].dt.normalize()
+    news_df = collapse_duplicates(news_df)  # rows stored before dedup existed may still repeat
+    news_df["published_at"] = news_df["published_at"].dt.normalize()
 
     return stock_df, news_df, session
 
 def fuzzy_join(stock_df, news_df):
     records = []
+    ingested_at = datetime.utcnow()
 
     for _, row in stock_df.iterrows():
         symbol = row["symbol"]
@@ -49,13 +54,13 @@ def fuzzy_join(stock_df, news_df):
             "sentiment_score": sentiment_score,
             "news_count": len(news_window),
             "price_delta": price_delta,
-            "ingested_at": datetime.utcnow().isoformat()
+            "ingested_at": ingested_at
         })
 
     df = pd.DataFrame(records)
     df.columns = [sanitize(col) for col in df.columns]
     df.reset_index(drop=True, inplace=True)
-    return df
+    return apply_schema(df, "FEATURE_SET", stage="features")
 
 def inject_synthetic_sentiment(df, mode="random"):
     if mode == "positive":
@@ -74,7 +79,7 @@ def write_features(session, df, table_name="FEATURE_SET"):
     session.use_schema("RAW")
     session.sql(f"DROP TABLE IF EXISTS {table_name}").collect()
 
-    snow_df = session.create_dataframe(df)
+    snow_df = session.create_dataframe(prepare_for_write(df, "FEATURE_SET"))
     snow_df.write.mode("overwrite").save_as_table(table_name)
 
     print(f"✅ {len(df)} feature rows written to RAW.{table_name}")
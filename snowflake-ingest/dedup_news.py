@@ -0,0 +1,148 @@
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import pandas as pd
+import numpy as np
+import hashlib
+import re
+
+# 🔧 Dedup tuning parameters
+NUM_PERM = 64              # MinHash signature length
+LSH_BANDS = 16             # 16 bands x 4 rows → candidate pairs from ~0.5 Jaccard
+SIMILARITY_THRESHOLD = 0.7 # estimated Jaccard needed to merge a candidate pair
+SHINGLE_SIZE = 4           # character n-grams; headlines are too short for word shingles
+CLUSTER_WINDOW = pd.Timedelta(days=1)  # copies further apart than this are separate stories
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "cmpid", "ocid"}  # plus any utm_*
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(42)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+def normalize_headline(text, source=None):
+    text = str(text or "").lower()
+    source = str(source or "").strip().lower()
+    if source:
+        # Drop a trailing " - Reuters" style tag, but only when it names the row's own source
+        text = re.sub(rf"\s+[-|–]\s+{re.escape(source)}\s*$", "", text)
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def normalize_url(url):
+    parts = urlsplit(str(url or "").strip())
+    # Query strings can identify the article (?id=123), so keep them minus tracking params
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS)
+    url = f"{parts.netloc.lower().removeprefix('www.')}{parts.path.rstrip('/')}"
+    return f"{url}?{urlencode(query)}" if query else url
+
+def _stable_hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+def minhash_signature(text):
+    if len(text) <= SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    # 32-bit shingle hashes keep a*x + b below 2**64, so uint64 math can't wrap before the modulo
+    hashes = np.array([_stable_hash(s) & 0xFFFFFFFF for s in shingles], dtype=np.uint64)
+    permuted = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+class _UnionFind:
+    def __init__(self, n, times=None):
+        self.parent = list(range(n))
+        # Earliest and latest timestamp per root, so merges can be bounded by the whole cluster's span
+        self.first = list(times) if times is not None else [pd.NaT] * n
+        self.last = list(self.first)
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def within(self, i, j, window):
+        """Whether merging i's and j's clusters keeps every copy within window of the earliest one."""
+        ri, rj = self.find(i), self.find(j)
+        firsts = [t for t in (self.first[ri], self.first[rj]) if not pd.isna(t)]
+        lasts = [t for t in (self.last[ri], self.last[rj]) if not pd.isna(t)]
+        return not firsts or max(lasts) - min(firsts) <= window
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            root, child = min(ri, rj), max(ri, rj)
+            self.parent[child] = root
+            firsts = [t for t in (self.first[root], self.first[child]) if not pd.isna(t)]
+            lasts = [t for t in (self.last[root], self.last[child]) if not pd.isna(t)]
+            self.first[root] = min(firsts) if firsts else pd.NaT
+            self.last[root] = max(lasts) if lasts else pd.NaT
+
+def cluster_ids(headlines, urls, sources=None, times=None):
+    """Union-find cluster ids; with times, no cluster spans more than CLUSTER_WINDOW."""
+    n = len(headlines)
+    sources = sources if sources is not None else [None] * n
+    normalized = [normalize_headline(h, s) for h, s in zip(headlines, sources)]
+    times = pd.to_datetime(pd.Series(times if times is not None else [None] * n), errors="coerce", utc=True).tolist()
+    uf = _UnionFind(n, times)
+
+    # Exact pass: identical URL or identical normalized headline; a copy that would stretch the
+    # cluster past the window starts a new cluster for that key
+    seen = {}
+    for i, (headline, url) in enumerate(zip(normalized, urls)):
+        for key in (f"h:{headline}" if headline else None, f"u:{normalize_url(url)}" if url else None):
+            if key is None:
+                continue
+            if key in seen and uf.within(seen[key], i, CLUSTER_WINDOW):
+                uf.union(seen[key], i)
+            else:
+                seen[key] = i
+
+    # Near-duplicate pass: MinHash + banded LSH over one representative per exact cluster
+    reps = sorted({uf.find(i) for i in range(n) if normalized[i]})
+    if len(reps) > 1:
+        signatures = np.vstack([minhash_signature(normalized[i]) for i in reps])
+        rows = NUM_PERM // LSH_BANDS
+        candidates = set()
+        for band in range(LSH_BANDS):
+            buckets = {}
+            for pos, sig in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+                buckets.setdefault(sig.tobytes(), []).append(pos)
+            for members in buckets.values():
+                for a in range(len(members)):
+                    for b in range(a + 1, len(members)):
+                        candidates.add((members[a], members[b]))
+        for a, b in candidates:
+            if uf.within(reps[a], reps[b], CLUSTER_WINDOW) and np.mean(signatures[a] == signatures[b]) >= SIMILARITY_THRESHOLD:
+                uf.union(reps[a], reps[b])
+
+    return [uf.find(i) for i in range(n)]
+
+def collapse_duplicates(df, headline_col="headline", url_col="url", time_col="published_at", group_col="symbol"):
+    """Collapse syndicated copies to the earliest-published row, with a duplicate_count column."""
+    if df.empty:
+        return df.assign(duplicate_count=pd.Series(dtype="int64"))
+
+    frames = []
+    groups = df.groupby(group_col, sort=False, observed=True) if group_col in df.columns else [(None, df)]
+    for _, group in groups:
+        group = group.sort_values(time_col, kind="stable") if time_col in group.columns else group
+        ids = cluster_ids(
+            group[headline_col].tolist(),
+            group[url_col].tolist() if url_col in group.columns else [""] * len(group),
+            sources=group["source"].tolist() if "source" in group.columns else None,
+            times=group[time_col].tolist() if time_col in group.columns else None,
+        )
+        group = group.assign(_cluster=ids)
+        if "duplicate_count" in group.columns:
+            # Re-collapsing stored rows: they already carry their own counts
+            counts = group["duplicate_count"].fillna(1).groupby(group["_cluster"]).transform("sum")
+        else:
+            counts = group.groupby("_cluster")["_cluster"].transform("size")
+        group = group.assign(duplicate_count=counts.astype("int64"))
+        frames.append(group.drop_duplicates("_cluster", keep="first").drop(columns="_cluster"))
+
+    collapsed = pd.concat(frames, ignore_index=True)
+    dropped = len(df) - len(collapsed)
+    if dropped:
+        print(f"🧹 Collapsed {dropped} duplicate articles ({len(df)} → {len(collapsed)})")
+    return collapsed
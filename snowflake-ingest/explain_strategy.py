@@ -1,22 +1,28 @@
 from config import get_snowflake_session
+from snapshot_cache import read_table
+from frame_schema import apply_schema
+from report_render import render_figures, line_series
+from artifact_io import write_artifact
 from datetime import datetime
 from dotenv import load_dotenv
 import pandas as pd
-import matplotlib.pyplot as plt
+import sys
+import _paths  # noqa: F401  (puts the repo root on sys.path)
+from trade_ledger import TradeLedger, BACKTEST_SCHEMA
 
 load_dotenv()
 
-def fetch_data():
-    session = get_snowflake_session()
+def fetch_data(session=None):
+    session = session or get_snowflake_session()
     session.use_schema("RAW")
 
-    features = session.table("FEATURE_SET").to_pandas()
+    features = apply_schema(read_table(session, "FEATURE_SET"), "FEATURE_SET", stage="explain load features")
     features["date"] = pd.to_datetime(features["date"])
     features.sort_values("date", inplace=True)
     features["price_threshold"] = features["price_delta"].rolling(window=10, min_periods=1).mean()
 
     try:
-        trades = session.table("BACKTEST_RESULTS").to_pandas()
+        trades = apply_schema(read_table(session, "BACKTEST_RESULTS"), "BACKTEST_RESULTS", stage="explain load trades")
         trades["date"] = pd.to_datetime(trades["date"], errors="coerce")
         trades["entry_date"] = pd.to_datetime(trades["entry_date"], errors="coerce")
         trades.sort_values("date", inplace=True)
@@ -33,73 +39,94 @@ def summarize(features, trades):
     print(f"Skipped signals: {len(features) - len(trades)}")
 
     if not trades.empty:
-        avg_hold = trades["holding_days"].mean()
-        final_capital = trades["capital"].iloc[-1]
-        print(f"Average holding duration: {avg_hold:.2f} days")
-        print(f"Final capital: ₹{final_capital:,.2f}")
+        ledger = TradeLedger.from_frame(trades, BACKTEST_SCHEMA)
+        print(f"Average holding duration: {ledger.avg_hold:.2f} days")
+        print(f"Final capital: ₹{ledger.final_capital:,.2f}")
     else:
         print("No trades executed—capital unchanged.")
 
-def narrate(features, trades):
+def narrate(features, trades, out=None):
+    out = out or sys.stdout  # resolved per call so redirect_stdout and test capture apply
+    lines = []
     if trades.empty:
-        print("\n🗣️ No trade narratives available—no trades executed.")
+        lines.append("\n🗣️ No trade narratives available—no trades executed.")
     else:
-        print("\n🗣️ Trade Narratives:")
-        for _, row in trades.iterrows():
-            print(
-                f"✅ {row['date'].date()}: Exited after {row['holding_days']} days "
-                f"with ₹{row['pnl']:.2f} P&L. Confidence: {row['confidence']} "
-                f"via {row['trigger_type'].upper()} (Signal Strength: {row['entry_signal_strength']})"
-            )
-
-    print("\n⚠️ Skipped Signals:")
-    for _, row in features.iterrows():
-        if row["sentiment_score"] == 0 and row["price_delta"] < row["price_threshold"]:
-            print(f"Skipped {row['date'].date()} — Neutral sentiment and weak price delta ({row['price_delta']:.2f})")
-
-def plot_thresholds(features):
-    plt.figure(figsize=(12, 6))
-    plt.plot(features["date"], features["sentiment_score"], label="Sentiment Score", color="blue")
-    plt.plot(features["date"], features["sentiment_score"].rolling(window=10, min_periods=1).mean(),
-             label="Sentiment Threshold", color="orange", linestyle="--")
-    plt.title("Sentiment Score vs Threshold")
-    plt.xlabel("Date")
-    plt.ylabel("Score")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
-
-    plt.figure(figsize=(12, 6))
-    plt.plot(features["date"], features["price_delta"], label="Price Δ", color="green")
-    plt.plot(features["date"], features["price_threshold"], label="Price Threshold", color="red", linestyle="--")
-    plt.title("Price Delta vs Threshold")
-    plt.xlabel("Date")
-    plt.ylabel("Price Movement")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
-
-def export_dashboard_data(features, trades):
-    features.to_csv("features_dashboard.csv", index=False)
+        lines.append("\n🗣️ Trade Narratives:")
+        narratives = (
+            "✅ " + trades["date"].dt.date.astype(str)
+            + ": Exited after " + trades["holding_days"].astype(str)
+            + " days with ₹" + trades["pnl"].map("{:.2f}".format)
+            + " P&L. Confidence: " + trades["confidence"].astype(str)
+            + " via " + trades["trigger_type"].astype(str).str.upper()
+            + " (Signal Strength: " + trades["entry_signal_strength"].astype(str) + ")"
+        )
+        lines.extend(narratives)
+
+    lines.append("\n⚠️ Skipped Signals:")
+    skipped = features[(features["sentiment_score"] == 0) & (features["price_delta"] < features["price_threshold"])]
+    lines.extend(
+        "Skipped " + skipped["date"].dt.date.astype(str)
+        + " — Neutral sentiment and weak price delta (" + skipped["price_delta"].map("{:.2f}".format) + ")"
+    )
+
+    out.write("\n".join(lines) + "\n")
+
+def plot_thresholds(features, out_dir="."):
+    dates = features["date"].to_numpy()
+    sentiment_threshold = features["sentiment_score"].rolling(window=10, min_periods=1).mean()
+    specs = [
+        {
+            "filename": "sentiment_vs_threshold.png",
+            "title": "Sentiment Score vs Threshold",
+            "xlabel": "Date",
+            "ylabel": "Score",
+            "series": [
+                line_series(dates, features["sentiment_score"], "Sentiment Score", color="blue"),
+                line_series(dates, sentiment_threshold, "Sentiment Threshold", color="orange", linestyle="--"),
+            ],
+        },
+        {
+            "filename": "price_delta_vs_threshold.png",
+            "title": "Price Delta vs Threshold",
+            "xlabel": "Date",
+            "ylabel": "Price Movement",
+            "series": [
+                line_series(dates, features["price_delta"], "Price Δ", color="green"),
+                line_series(dates, features["price_threshold"], "Price Threshold", color="red", linestyle="--"),
+            ],
+        },
+    ]
+    return render_figures(specs, out_dir)
+
+def export_dashboard_data(features, trades, mode=None, params=None, fmt=None):
+    # With a mode, trades land as trades_dashboard_<mode> for compare_modes to pick up
+    metadata = {"mode": mode, "params": params or {}}
+    write_artifact(features, "features_dashboard", metadata=metadata, fmt=fmt)
     if not trades.empty:
-        trades.to_csv("trades_dashboard.csv", index=False)
+        trades_name = f"trades_dashboard_{mode}" if mode else "trades_dashboard"
+        write_artifact(trades, trades_name, "trades", metadata, fmt)
 
-        trigger_counts = trades["trigger_type"].value_counts().reset_index()
-        trigger_counts.columns = ["trigger_type", "count"]
-        trigger_counts.to_csv("trigger_distribution.csv", index=False)
+        ledger = TradeLedger.from_frame(trades, BACKTEST_SCHEMA)
+        trigger_counts = pd.DataFrame(list(ledger.group_counts().items()), columns=["trigger_type", "count"])
+        trigger_counts = trigger_counts.sort_values("count", ascending=False)
+        write_artifact(trigger_counts, "trigger_distribution", "trigger_distribution", metadata, fmt)
 
-        trigger_pnl = trades.groupby("trigger_type")["pnl"].sum().reset_index()
-        trigger_pnl.columns = ["trigger_type", "total_pnl"]
-        trigger_pnl.to_csv("trigger_pnl.csv", index=False)
+        trigger_pnl = pd.DataFrame(list(ledger.group_pnl().items()), columns=["trigger_type", "total_pnl"])
+        write_artifact(trigger_pnl.sort_values("trigger_type"), "trigger_pnl", "trigger_pnl", metadata, fmt)
 
     print("📁 Dashboard data exported.")
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize, narrate and export the latest backtest")
+    parser.add_argument("--mode", help="sentiment mode the backtest ran with; names the trades export")
+    parser.add_argument("--format", choices=["parquet", "arrow", "csv"], help="export format (default: parquet)")
+    args = parser.parse_args()
+
     features, trades = fetch_data()
     summarize(features, trades)
     narrate(features, trades)
     plot_thresholds(features)
-    export_dashboard_data(features, trades)
+    export_dashboard_data(features, trades, mode=args.mode, fmt=args.format)
 
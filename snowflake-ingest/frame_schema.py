@@ -0,0 +1,91 @@
+import pandas as pd
+
+# Compact in-memory dtypes per table. Floats stay float64: PnL, capital and price_delta are
+# computed from the prices, so float32 inputs would leak rounding error into stored results.
+# The savings come from categoricals, narrow ints and parsed datetimes. price_trend is a
+# two-level categorical (int8 codes), so comparisons like row["price_trend"] == "down" keep working.
+SCHEMAS = {
+    "STOCK_DATA": {
+        "symbol": "category",
+        "date": "datetime64[ns]",
+        "open": "float64",
+        "high": "float64",
+        "low": "float64",
+        "close": "float64",
+        "volume": "int64",
+        "ingested_at": "datetime64[ns]",
+    },
+    "NEWS_RAW": {
+        "symbol": "category",
+        "sentiment": "category",
+        "source": "category",
+        "published_at": "datetime64[ns]",
+        "ingested_at": "datetime64[ns]",
+        "duplicate_count": "int32",
+    },
+    "FEATURE_SET": {
+        "symbol": "category",
+        "date": "datetime64[ns]",
+        "open": "float64",
+        "close": "float64",
+        "volume": "int64",
+        "price_trend": "category",
+        "sentiment_score": "int16",
+        "news_count": "int32",
+        "price_delta": "float64",
+        "ingested_at": "datetime64[ns]",
+    },
+    "BACKTEST_RESULTS": {
+        "entry_date": "datetime64[ns]",
+        "date": "datetime64[ns]",
+        "entry": "float64",
+        "exit": "float64",
+        "pnl": "float64",
+        "capital": "float64",
+        "holding_days": "int32",
+        "signal": "category",
+        "confidence": "float64",
+        "trigger_type": "category",
+        "entry_signal_strength": "float64",
+    },
+}
+
+# Columns that were written as text or DATE before compaction; converting back on write
+# keeps the existing Snowflake column types unchanged.
+STORAGE_FORMATS = {
+    "STOCK_DATA": {"date": "%Y-%m-%d", "ingested_at": "%Y-%m-%dT%H:%M:%S.%f"},
+    "NEWS_RAW": {"published_at": "%Y-%m-%dT%H:%M:%SZ", "ingested_at": "%Y-%m-%dT%H:%M:%S.%f"},
+    "FEATURE_SET": {"date": "date", "ingested_at": "%Y-%m-%dT%H:%M:%S.%f"},
+}
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1_000_000
+
+def apply_schema(df, table_name, stage=None):
+    """Cast known columns to the table's compact dtypes; with a stage name, report memory saved."""
+    before = memory_mb(df) if stage else None
+    df = df.copy(deep=False)
+    for column, dtype in SCHEMAS[table_name].items():
+        if column not in df.columns:
+            continue
+        if dtype.startswith("datetime64"):
+            values = pd.to_datetime(df[column], errors="coerce", utc=True)
+            df[column] = values.dt.tz_localize(None).astype(dtype)
+        elif dtype.startswith("int"):
+            df[column] = pd.to_numeric(df[column], errors="coerce").fillna(0).astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+
+    if stage:
+        print(f"🧮 {stage}: {len(df)} rows, {before:.2f} MB → {memory_mb(df):.2f} MB")
+    return df
+
+def prepare_for_write(df, table_name):
+    """Schema-cast df, then convert it back to the storage types Snowflake already has."""
+    df = apply_schema(df, table_name)
+    for column, fmt in STORAGE_FORMATS.get(table_name, {}).items():
+        if column in df.columns:
+            df[column] = df[column].dt.date if fmt == "date" else df[column].dt.strftime(fmt)
+    for column in df.select_dtypes("category").columns:
+        df[column] = df[column].astype(object)
+    return df
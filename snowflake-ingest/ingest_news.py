@@ -1,10 +1,13 @@
 from config import get_snowflake_session
-import requests
 import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 from snowflake.connector.pandas_tools import write_pandas
+from dedup_news import collapse_duplicates
+from frame_schema import apply_schema, prepare_for_write
 import re
+import _paths  # noqa: F401  (puts the repo root on sys.path)
+import transport
 
 load_dotenv()
 
@@ -18,7 +21,7 @@ def fetch_news(symbol):
         "language": "en",
         "apiKey": NEWS_API_KEY
     }
-    response = requests.get(NEWS_API_URL, params=params)
+    response = transport.get(NEWS_API_URL, params=params)
     if response.status_code != 200:
         raise Exception(f"News API error: {response.status_code}")
 
@@ -28,22 +31,21 @@ def fetch_news(symbol):
 
     records = []
     for article in articles:
-        headline = article.get("title", "")
-        sentiment = score_sentiment(headline)
         records.append({
             "symbol": symbol,
-            "headline": headline,
-            "sentiment": sentiment,
-            "source": article.get("source", {}).get("name", ""),
+            "headline": article.get("title", "") or "",
+            "source": (article.get("source") or {}).get("name", ""),
             "url": article.get("url", ""),
             "published_at": article.get("publishedAt", ""),
             "ingested_at": datetime.utcnow().isoformat()
         })
 
-    df = pd.DataFrame(records)
+    # Collapse syndicated copies first so each story is scored and stored once
+    df = collapse_duplicates(pd.DataFrame(records))
+    df.insert(2, "sentiment", df["headline"].map(score_sentiment))
     df.columns = [sanitize_column_name(col) for col in df.columns]
     df.reset_index(drop=True, inplace=True)
-    return df
+    return apply_schema(df, "NEWS_RAW", stage=f"ingest_news {symbol}")
 
 def sanitize_column_name(name):
     name = str(name).strip().lower()
@@ -62,19 +64,27 @@ def score_sentiment(text):
 def ensure_schema_exists(session, schema_name):
     session.sql(f"CREATE SCHEMA IF NOT EXISTS {schema_name}").collect()
 
-def write_to_snowflake(df, table_name="NEWS_RAW"):
-    session = get_snowflake_session()
+def ensure_duplicate_count_column(session, table_name):
+    # NEWS_RAW tables created before dedup lack the column, and appends would fail; older rows count as 1
+    session.sql(f'ALTER TABLE IF EXISTS {table_name} ADD COLUMN IF NOT EXISTS "duplicate_count" NUMBER DEFAULT 1').collect()
+
+def write_to_snowflake(df, table_name="NEWS_RAW", session=None, overwrite=True, table_type=""):
+    session = session or get_snowflake_session()
     schema = session.get_current_schema()
     ensure_schema_exists(session, schema)
+    if not overwrite and not table_type:
+        ensure_duplicate_count_column(session, table_name)
+    df = prepare_for_write(df, "NEWS_RAW")
 
-    conn = session._conn._conn
     success, nchunks, nrows, _ = write_pandas(
-        conn,
+        session.connection,
         df,
         table_name,
         database=session.get_current_database(),
         schema=schema,
-        overwrite=True
+        overwrite=overwrite,
+        auto_create_table=True,
+        table_type=table_type
     )
 
     if success:
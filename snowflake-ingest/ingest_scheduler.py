@@ -0,0 +1,220 @@
+from session_pool import get_pool
+from snowflake.snowpark.exceptions import SnowparkSQLException
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from datetime import datetime, date, timedelta
+from dotenv import load_dotenv
+import argparse
+import heapq
+import json
+import os
+import threading
+import time
+import uuid
+
+import ingest_stock
+import ingest_news
+import transport
+
+load_dotenv()
+
+# 🔧 Scheduler tuning parameters
+CHECKPOINT_PATH = os.getenv("INGEST_CHECKPOINT", ".ingest_checkpoint.json")
+REFRESH_HOURS = 20  # symbols fetched more recently than this are skipped
+
+# Free-tier limits: Alpha Vantage 5 calls/min and 25/day, NewsAPI 100/day
+DEFAULT_QUOTAS = {
+    "alphavantage": {"per_minute": 5, "per_day": 25, "concurrency": 2},
+    "newsapi": {"per_minute": None, "per_day": 100, "concurrency": 4},
+}
+
+DEFERRED = "deferred"  # ingest_one result when the daily quota ran out before the call
+
+# Schema fixes applied to an existing target before rows are swapped in from staging
+TABLE_MIGRATIONS = {"NEWS_RAW": ingest_news.ensure_duplicate_count_column}
+
+PROVIDERS = {
+    "alphavantage": (ingest_stock.fetch_stock_data, ingest_stock.write_to_snowflake, "STOCK_DATA"),
+    "newsapi": (ingest_news.fetch_news, ingest_news.write_to_snowflake, "NEWS_RAW"),
+}
+
+class RateLimiter:
+    """Sliding one-minute window plus a daily cap that survives restarts via the checkpoint."""
+
+    def __init__(self, per_minute=None, per_day=None, used_today=0):
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.used_today = used_today
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                if self.per_day is not None and self.used_today >= self.per_day:
+                    return False
+                now = time.monotonic()
+                while self._recent and now - self._recent[0] >= 60:
+                    self._recent.popleft()
+                if self.per_minute is None or len(self._recent) < self.per_minute:
+                    self._recent.append(now)
+                    self.used_today += 1
+                    return True
+                wait = 60 - (now - self._recent[0])
+            time.sleep(wait)
+
+class Checkpoint:
+    def __init__(self, path=CHECKPOINT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {"last_fetched": {}, "usage": {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def last_fetched(self, provider, symbol):
+        value = self.state["last_fetched"].get(provider, {}).get(symbol)
+        return datetime.fromisoformat(value) if value else None
+
+    def used_today(self, provider):
+        usage = self.state["usage"].get(provider, {})
+        return usage.get("calls", 0) if usage.get("date") == date.today().isoformat() else 0
+
+    def record_call(self, provider):
+        with self._lock:
+            today = date.today().isoformat()
+            usage = self.state["usage"].get(provider, {})
+            if usage.get("date") != today:
+                usage = {"date": today, "calls": 0}
+            usage["calls"] += 1
+            self.state["usage"][provider] = usage
+            self._save()
+
+    def mark_done(self, provider, symbol):
+        with self._lock:
+            self.state["last_fetched"].setdefault(provider, {})[symbol] = datetime.utcnow().isoformat()
+            self._save()
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+def build_queue(provider, universe, checkpoint, open_positions=(), refresh_hours=REFRESH_HOURS):
+    # Open positions first, then stalest (never-fetched sorts as oldest)
+    cutoff = datetime.utcnow() - timedelta(hours=refresh_hours)
+    queue = []
+    for symbol in universe:
+        last = checkpoint.last_fetched(provider, symbol)
+        if last and last > cutoff:
+            continue
+        staleness = last.timestamp() if last else 0.0
+        heapq.heappush(queue, (0 if symbol in open_positions else 1, staleness, symbol))
+    return queue
+
+def replace_symbol_rows(session, table_name, symbol, df, writer):
+    # Load into a session-scoped staging table first, so a failed write never leaves the
+    # symbol deleted; the swap itself is one DELETE + INSERT transaction
+    staging = f"{table_name}_STAGE_{uuid.uuid4().hex[:8].upper()}"
+    writer(df, table_name=staging, session=session, overwrite=False, table_type="temporary")
+    columns = ", ".join(f'"{column}"' for column in df.columns)
+    try:
+        if table_name in TABLE_MIGRATIONS:
+            TABLE_MIGRATIONS[table_name](session, table_name)
+        session.sql("BEGIN").collect()
+        session.sql(f"DELETE FROM {table_name} WHERE \"symbol\" = ?", params=[symbol]).collect()
+        session.sql(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging}").collect()
+        session.sql("COMMIT").collect()
+    except SnowparkSQLException as e:
+        session.sql("ROLLBACK").collect()
+        if "does not exist" not in str(e):
+            raise
+        # first run: the writer creates the table
+        writer(df, table_name=table_name, session=session, overwrite=False)
+    finally:
+        session.sql(f"DROP TABLE IF EXISTS {staging}").collect()
+
+def ingest_one(provider, symbol, checkpoint, limiter):
+    fetch, writer, table_name = PROVIDERS[provider]
+    # Take the quota slot right before the request goes out, not when the task was queued
+    if not limiter.acquire():
+        return DEFERRED
+    if transport.HTTP_MODE != "replay":
+        checkpoint.record_call(provider)
+    try:
+        df = fetch(symbol)
+        with get_pool().session() as session:
+            replace_symbol_rows(session, table_name, symbol, df, writer)
+        checkpoint.mark_done(provider, symbol)
+        return len(df)
+    except Exception as e:
+        print(f"❌ {provider} {symbol}: {e}")
+        return None
+
+def dispatch_provider(provider, universe, quota, checkpoint, open_positions, refresh_hours):
+    queue = build_queue(provider, universe, checkpoint, open_positions, refresh_hours)
+    stats = {"queued": len(queue), "ok": 0, "failed": 0, "rows": 0, "deferred": 0}
+    if transport.HTTP_MODE == "replay":
+        limiter = RateLimiter()  # replayed responses cost no provider quota
+    else:
+        limiter = RateLimiter(quota.get("per_minute"), quota.get("per_day"), checkpoint.used_today(provider))
+
+    futures = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=quota.get("concurrency", 1)) as executor:
+        while queue:
+            _, _, symbol = heapq.heappop(queue)
+            futures.append(executor.submit(ingest_one, provider, symbol, checkpoint, limiter))
+
+    for future in futures:
+        rows = future.result()
+        if rows is DEFERRED:
+            stats["deferred"] += 1
+        elif rows is None:
+            stats["failed"] += 1
+        else:
+            stats["ok"] += 1
+            stats["rows"] += rows
+    if stats["deferred"]:
+        print(f"⏸️ {provider}: daily quota reached, {stats['deferred']} symbols deferred to next run")
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+def run_schedule(universe, quotas=None, open_positions=(), checkpoint_path=CHECKPOINT_PATH,
+                 refresh_hours=REFRESH_HOURS):
+    quotas = quotas or DEFAULT_QUOTAS
+    checkpoint = Checkpoint(checkpoint_path)
+    open_positions = set(open_positions)
+    # Every worker may hold a session while writing; don't let them queue behind a smaller pool
+    get_pool().grow_to(sum(quota.get("concurrency", 1) for quota in quotas.values()))
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(quotas)) as executor:
+        futures = {
+            provider: executor.submit(dispatch_provider, provider, universe, quota,
+                                      checkpoint, open_positions, refresh_hours)
+            for provider, quota in quotas.items()
+        }
+        for provider, future in futures.items():
+            results[provider] = future.result()
+
+    print("\n📈 Ingest throughput:")
+    for provider, s in results.items():
+        per_min = (s["ok"] + s["failed"]) / s["elapsed"] * 60 if s["elapsed"] else 0
+        print(f"{provider:<14} queued {s['queued']:>4} | ok {s['ok']:>4} | failed {s['failed']:>3} | "
+              f"deferred {s['deferred']:>4} | rows {s['rows']:>7} | {per_min:.1f} calls/min")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quota-aware ingest of a symbol universe")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--open-positions", nargs="*", default=[])
+    parser.add_argument("--refresh-hours", type=float, default=REFRESH_HOURS)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH)
+    args = parser.parse_args()
+    try:
+        run_schedule(args.symbols, open_positions=args.open_positions,
+                     checkpoint_path=args.checkpoint, refresh_hours=args.refresh_hours)
+    finally:
+        get_pool().close_all()
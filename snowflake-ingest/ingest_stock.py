@@ -1,9 +1,11 @@
 from config import get_snowflake_session
-import requests
 import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 from snowflake.connector.pandas_tools import write_pandas
+from frame_schema import apply_schema, prepare_for_write
+import _paths  # noqa: F401  (puts the repo root on sys.path)
+import transport
 
 load_dotenv()
 
@@ -16,7 +18,7 @@ def fetch_stock_data(symbol):
         "symbol": symbol,
         "apikey": ALPHA_VANTAGE_API_KEY
     }
-    response = requests.get(ALPHA_VANTAGE_URL, params=params)
+    response = transport.get(ALPHA_VANTAGE_URL, params=params)
     if response.status_code != 200:
         raise Exception(f"Alpha Vantage error: {response.status_code}")
 
@@ -37,19 +39,21 @@ def fetch_stock_data(symbol):
             "ingested_at": datetime.utcnow().isoformat()
         })
 
-    return pd.DataFrame(records)
+    return apply_schema(pd.DataFrame(records), "STOCK_DATA", stage=f"ingest_stock {symbol}")
 
-def write_to_snowflake(df, table_name="STOCK_DATA"):
-    session = get_snowflake_session()
-    conn = session._conn._conn  # Get raw connector from Snowpark session
+def write_to_snowflake(df, table_name="STOCK_DATA", session=None, overwrite=True, table_type=""):
+    session = session or get_snowflake_session()
+    df = prepare_for_write(df, "STOCK_DATA")
 
     success, nchunks, nrows, _ = write_pandas(
-        conn,
+        session.connection,  # raw connector behind the Snowpark session
         df,
         table_name,
         database=session.get_current_database(),
         schema=session.get_current_schema(),
-        overwrite=True
+        overwrite=overwrite,
+        auto_create_table=True,
+        table_type=table_type
     )
 
     if success:
@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import numpy as np
+import os
+
+# 🔧 Rendering parameters
+MAX_PLOT_POINTS = 2000  # series longer than this are LTTB-downsampled before plotting
+FIGSIZE = (12, 6)
+
+def lttb(x, y, n_out=MAX_PLOT_POINTS):
+    """Largest-Triangle-Three-Buckets downsampling; keeps the visual shape of a long series."""
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    is_time = np.issubdtype(x.dtype, np.datetime64)
+    xf = x.astype("datetime64[ns]").astype(np.int64).astype(float) if is_time else x.astype(float)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        nxt_start, nxt_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xf[nxt_start:nxt_end].mean()
+        avg_y = y[nxt_start:nxt_end].mean()
+        area = np.abs((xf[a] - avg_x) * (y[start:end] - y[a]) - (xf[a] - xf[start:end]) * (avg_y - y[a]))
+        a = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+def line_series(x, y, label, n_out=MAX_PLOT_POINTS, **style):
+    x, y = lttb(x, y, n_out)
+    return {"x": x, "y": y, "label": label, **style}
+
+def scatter_series(x, y, label, n_out=MAX_PLOT_POINTS, **style):
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    if len(x) > n_out:
+        # LTTB assumes an ordered series; a seeded uniform sample keeps the point cloud's shape
+        keep = np.sort(np.random.RandomState(0).choice(len(x), n_out, replace=False))
+        x, y = x[keep], y[keep]
+    return {"x": x, "y": y, "label": label, **style}
+
+def _render(spec):
+    # Imported lazily with the Agg backend so rendering stays headless; with workers > 1 only the
+    # worker processes load matplotlib
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=spec.get("figsize", FIGSIZE))
+    kind = spec.get("kind", "line")
+    if kind == "bar":
+        categories = spec["categories"]
+        width = 0.8 / max(len(spec["series"]), 1)
+        for i, series in enumerate(spec["series"]):
+            positions = np.arange(len(categories)) + (i - (len(spec["series"]) - 1) / 2) * width
+            ax.bar(positions, series["y"], width=width, label=series["label"])
+        ax.set_xticks(np.arange(len(categories)))
+        ax.set_xticklabels(categories, rotation=90)
+    else:
+        for series in spec["series"]:
+            style = {k: v for k, v in series.items() if k not in ("x", "y")}
+            if kind == "scatter":
+                ax.scatter(series["x"], series["y"], **style)
+            else:
+                ax.plot(series["x"], series["y"], **style)
+
+    if "axhline" in spec:
+        ax.axhline(spec["axhline"], color="gray", linestyle="--")
+    ax.set_title(spec["title"])
+    ax.set_xlabel(spec["xlabel"])
+    ax.set_ylabel(spec["ylabel"])
+    if spec["series"]:
+        ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    fig.savefig(spec["path"])
+    plt.close(fig)
+    return spec["path"]
+
+def render_figures(specs, out_dir=".", workers=None):
+    """Render figure specs to PNG files, one worker process per figure."""
+    os.makedirs(out_dir, exist_ok=True)
+    for spec in specs:
+        spec["path"] = os.path.join(out_dir, spec["filename"])
+
+    workers = min(workers or os.cpu_count() or 1, len(specs))
+    if workers <= 1:
+        paths = [_render(spec) for spec in specs]
+    else:
+        # spawn, not fork: the parent may hold a Snowflake session whose heartbeat thread fork would copy mid-lock
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            paths = list(executor.map(_render, specs))
+
+    for path in paths:
+        print(f"🖼️ Saved {path}")
+    return paths
@@ -0,0 +1,80 @@
+from session_pool import get_pool
+from dotenv import load_dotenv
+import argparse
+import time
+
+import ingest_scheduler
+import create_features
+import backtest_strategy
+import explain_strategy
+
+load_dotenv()
+
+def stage_ingest(symbols, open_positions):
+    # The scheduler draws its own pooled sessions for concurrent writes
+    ingest_scheduler.run_schedule(symbols, open_positions=open_positions)
+
+def stage_features(session, sentiment_mode):
+    stock_df, news_df, _ = create_features.fetch_dataframes(session)
+    feature_df = create_features.fuzzy_join(stock_df, news_df)
+    feature_df = create_features.inject_synthetic_sentiment(feature_df, mode=sentiment_mode)
+    create_features.write_features(session, feature_df)
+
+def stage_backtest(session, sentiment_mode=None):
+    feature_df, _ = backtest_strategy.fetch_feature_set(session, sentiment_mode or backtest_strategy.SENTIMENT_MODE)
+    trades_df = backtest_strategy.simulate_strategy(feature_df)
+    backtest_strategy.write_backtest_results(session, trades_df)
+
+def stage_explain(session, sentiment_mode=None):
+    features, trades = explain_strategy.fetch_data(session)
+    explain_strategy.summarize(features, trades)
+    explain_strategy.narrate(features, trades)
+    explain_strategy.plot_thresholds(features)
+    params = {
+        "min_signal_strength": backtest_strategy.MIN_SIGNAL_STRENGTH,
+        "fallback_sell_threshold": backtest_strategy.FALLBACK_SELL_THRESHOLD,
+        "momentum_buy_threshold": backtest_strategy.MOMENTUM_BUY_THRESHOLD,
+        "momentum_sell_threshold": backtest_strategy.MOMENTUM_SELL_THRESHOLD,
+    }
+    mode = sentiment_mode or backtest_strategy.SENTIMENT_MODE
+    explain_strategy.export_dashboard_data(features, trades, mode=mode, params=params)
+
+def run_pipeline(symbols=("IBM",), sentiment_mode="random", skip_ingest=False, open_positions=()):
+    # (name, callable, needs_session)
+    stages = []
+    if not skip_ingest:
+        stages.append(("ingest", lambda: stage_ingest(symbols, open_positions), False))
+    stages.append(("features", lambda s: stage_features(s, sentiment_mode), True))
+    stages.append(("backtest", lambda s: stage_backtest(s, sentiment_mode), True))
+    stages.append(("explain", lambda s: stage_explain(s, sentiment_mode), True))
+
+    pool = get_pool()
+    timings = []
+    try:
+        for name, stage, needs_session in stages:
+            print(f"\n▶️ Stage: {name}")
+            start = time.perf_counter()
+            if needs_session:
+                with pool.session() as session:
+                    stage(session)
+            else:
+                stage()
+            timings.append((name, time.perf_counter() - start))
+    finally:
+        pool.close_all()
+
+    print("\n⏱️ Stage timings:")
+    for name, elapsed in timings:
+        print(f"{name:<14}{elapsed:>8.2f}s")
+    print(f"{'total':<14}{sum(t for _, t in timings):>8.2f}s")
+    print(f"🔌 Sessions created: {pool.stats['created']} | reused: {pool.stats['reused']} | discarded: {pool.stats['discarded']}")
+    return timings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run ingest → features → backtest → explain on shared Snowflake sessions")
+    parser.add_argument("--symbols", nargs="+", default=["IBM"])
+    parser.add_argument("--open-positions", nargs="*", default=[])
+    parser.add_argument("--sentiment-mode", default="random", choices=["positive", "negative", "random"])
+    parser.add_argument("--skip-ingest", action="store_true")
+    args = parser.parse_args()
+    run_pipeline(args.symbols, args.sentiment_mode, args.skip_ingest, args.open_positions)
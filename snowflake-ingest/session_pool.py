@@ -0,0 +1,119 @@
+from config import get_snowflake_session
+from contextlib import contextmanager
+import threading
+import time
+
+# 🔧 Pool tuning parameters
+POOL_SIZE = 2                 # max concurrent Snowflake sessions
+ACQUIRE_TIMEOUT = 300         # seconds to wait for a free session
+HEALTH_CHECK_INTERVAL = 300   # re-check sessions idle longer than this
+HEALTH_CHECK_SQL = "SELECT 1"
+
+class SessionPool:
+    """Bounded pool of Snowpark sessions, created lazily and health-checked on reuse."""
+
+    def __init__(self, max_size=POOL_SIZE, factory=get_snowflake_session,
+                 health_check_interval=HEALTH_CHECK_INTERVAL):
+        self.max_size = max_size
+        self.factory = factory
+        self.health_check_interval = health_check_interval
+        self._idle = []  # (session, last_used) pairs, most recent last
+        self._created = 0
+        self._cond = threading.Condition()
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def _is_healthy(self, session):
+        try:
+            session.sql(HEALTH_CHECK_SQL).collect()
+            return True
+        except Exception as e:
+            print(f"⚠️ Dropping stale Snowflake session: {e}")
+            return False
+
+    def _discard(self, session):
+        try:
+            session.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created -= 1
+            self.stats["discarded"] += 1
+            self._cond.notify()
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._created >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No Snowflake session free after {timeout}s")
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    session, last_used = self._idle.pop()
+                else:
+                    self._created += 1
+                    session, last_used = None, None
+
+            if session is None:
+                try:
+                    session = self.factory()
+                except Exception:
+                    with self._cond:
+                        self._created -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self.stats["created"] += 1
+                return session
+
+            if time.monotonic() - last_used < self.health_check_interval or self._is_healthy(session):
+                with self._cond:
+                    self.stats["reused"] += 1
+                return session
+            self._discard(session)
+
+    def release(self, session):
+        with self._cond:
+            self._idle.append((session, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def session(self):
+        session = self.acquire()
+        try:
+            yield session
+        except Exception:
+            # A failed stage may leave the session mid-transaction; don't hand it on
+            self._discard(session)
+            raise
+        else:
+            self.release(session)
+
+    def grow_to(self, max_size):
+        with self._cond:
+            self.max_size = max(self.max_size, max_size)
+            self._cond.notify_all()
+
+    def close_all(self):
+        # Normal shutdown: close idle sessions without counting them as discarded
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for session, _ in idle:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+def get_pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = SessionPool()
+        return _POOL
@@ -0,0 +1,66 @@
+import pyarrow as pa
+import json
+import os
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_CACHE_DIR", ".snapshot_cache")
+
+FINGERPRINT_SQL = """
+    SELECT LAST_ALTERED, ROW_COUNT
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{table}'
+"""
+
+def _paths(schema, table_name):
+    base = os.path.join(SNAPSHOT_DIR, f"{schema}.{table_name}")
+    return f"{base}.arrow", f"{base}.json"
+
+def table_fingerprint(session, table_name, schema="RAW"):
+    rows = session.sql(FINGERPRINT_SQL.format(schema=schema, table=table_name)).collect()
+    if not rows:
+        return None
+    return {"last_altered": str(rows[0][0]), "row_count": int(rows[0][1] or 0)}
+
+def _load_snapshot(data_path):
+    with pa.memory_map(data_path, "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+def _save_snapshot(df, fingerprint, data_path, meta_path):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{data_path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, data_path)
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(fingerprint, f)
+    os.replace(tmp_path, meta_path)
+
+def _load_fingerprint(meta_path):
+    # A missing or unreadable fingerprint is just a cache miss; the next pull rewrites it
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def read_table(session, table_name, schema="RAW"):
+    """Read a Snowflake table through a local Arrow snapshot keyed by LAST_ALTERED/ROW_COUNT."""
+    fingerprint = table_fingerprint(session, table_name, schema)
+    if fingerprint is None:
+        # Unknown table: let Snowflake raise the usual "does not exist" error
+        return session.table(f"{schema}.{table_name}").to_pandas()
+
+    data_path, meta_path = _paths(schema, table_name)
+    cached_fp = _load_fingerprint(meta_path) if os.path.exists(data_path) else None
+
+    if cached_fp == fingerprint:
+        print(f"⚡ {schema}.{table_name} unchanged — loaded from local snapshot")
+        return _load_snapshot(data_path)
+
+    df = session.table(f"{schema}.{table_name}").to_pandas()
+    print(f"⬇️ {schema}.{table_name}: pulled {len(df)} rows from Snowflake")
+
+    _save_snapshot(df, fingerprint, data_path, meta_path)
+    return df
@@ -0,0 +1,39 @@
+from backtest_strategy import fetch_feature_set, apply_sentiment_mode, simulate_ledger
+from artifact_io import write_artifact
+from dotenv import load_dotenv
+import pandas as pd
+import itertools
+
+load_dotenv()
+
+# 🔧 Default parameter grid; every combination is backtested per sentiment mode
+SWEEP_GRID = {
+    "min_signal_strength": [0.8, 1.0, 1.2, 1.5],
+    "momentum_buy_threshold": [1.2, 1.5, 2.0],
+    "fallback_sell_threshold": [-1.0, -1.2, -1.5],
+}
+SWEEP_MODES = ["positive", "negative", "random"]
+
+def run_sweep(features, modes=SWEEP_MODES, grid=SWEEP_GRID):
+    names = list(grid)
+    rows = []
+    for mode in modes:
+        df = apply_sentiment_mode(features.copy(), mode)
+        for values in itertools.product(*(grid[name] for name in names)):
+            params = dict(zip(names, values))
+            ledger = simulate_ledger(df, verbose=False, **params)
+            rows.append({"mode": mode, **params, **ledger.summary(), "final_capital": ledger.final_capital})
+
+    summary = pd.DataFrame(rows).sort_values("total_pnl", ascending=False, ignore_index=True)
+    print(f"\n🧪 {len(summary)} parameter combinations backtested")
+    print(summary.head(10).to_string(index=False))
+    return summary
+
+def export_sweep(summary, fmt=None):
+    path = write_artifact(summary, "sweep_summary", metadata={"grid": SWEEP_GRID}, fmt=fmt)
+    print(f"📁 Sweep results exported to {path}")
+
+if __name__ == "__main__":
+    features, session = fetch_feature_set(sentiment_mode=None)
+    export_sweep(run_sweep(features))
+    session.close()
@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+
+# Column layouts: numpy dtype, "category" (int16 codes + label list) or "object" for free text
+DASHBOARD_SCHEMA = {
+    "symbol": "category",
+    "entry_date": "datetime64[ns]",
+    "exit_date": "datetime64[ns]",
+    "entry_price": "float64",
+    "exit_price": "float64",
+    "quantity": "int32",
+    "capital": "float64",
+    "pnl": "float64",
+    "holding_days": "int32",
+    "momentum_score": "float64",
+    "sentiment_score": "float64",
+    "final_signal": "category",
+    "article_title": "object",
+    "article_url": "object",
+    "reason": "category",
+}
+
+BACKTEST_SCHEMA = {
+    "entry_date": "datetime64[ns]",
+    "date": "datetime64[ns]",
+    "entry": "float64",
+    "exit": "float64",
+    "pnl": "float64",
+    "capital": "float64",
+    "holding_days": "int32",
+    "signal": "category",
+    "confidence": "float64",
+    "trigger_type": "category",
+    "entry_signal_strength": "float64",
+}
+
+class TradeLedger:
+    """Preallocated, array-backed trade log with running capital and incremental aggregates."""
+
+    __slots__ = (
+        "schema", "group_col", "running_capital", "_size", "_capacity", "_columns",
+        "_labels", "_codes", "_net_pnl", "_hold_sum", "_group_counts", "_group_pnl",
+    )
+
+    def __init__(self, schema=BACKTEST_SCHEMA, group_col="trigger_type", starting_capital=0.0, capacity=1024):
+        self.schema = schema
+        self.group_col = group_col
+        self.running_capital = float(starting_capital)
+        self._size = 0
+        self._capacity = max(int(capacity), 1)
+        self._columns = {name: self._empty(kind, self._capacity) for name, kind in schema.items()}
+        self._labels = {name: [] for name, kind in schema.items() if kind == "category"}
+        self._codes = {name: {} for name in self._labels}
+        self._net_pnl = 0.0
+        self._hold_sum = 0
+        self._group_counts = {}
+        self._group_pnl = {}
+
+    @staticmethod
+    def _empty(kind, n):
+        if kind == "category":
+            return np.full(n, -1, dtype=np.int16)
+        if kind == "object":
+            return np.empty(n, dtype=object)
+        if kind.startswith("datetime64"):
+            return np.full(n, np.datetime64("NaT"), dtype=kind)
+        return np.zeros(n, dtype=kind)
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, values in self._columns.items():
+            grown = self._empty(self.schema[name], self._capacity)
+            grown[:self._size] = values[:self._size]
+            self._columns[name] = grown
+
+    def _encode(self, name, value):
+        if value is None:
+            return -1
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._labels[name])
+            self._labels[name].append(value)
+        return code
+
+    def __len__(self):
+        return self._size
+
+    def append(self, **trade):
+        if self._size == self._capacity:
+            self._grow()
+
+        pnl = float(trade.get("pnl", 0.0))
+        self.running_capital += pnl
+        if "capital" in self.schema and "capital" not in trade:
+            trade["capital"] = self.running_capital
+
+        i = self._size
+        for name, kind in self.schema.items():
+            value = trade.get(name)
+            if kind == "category":
+                self._columns[name][i] = self._encode(name, value)
+            elif value is not None:
+                self._columns[name][i] = value
+        self._size += 1
+
+        self._net_pnl += pnl
+        self._hold_sum += int(trade.get("holding_days", 0))
+        if self.group_col:
+            group = trade.get(self.group_col)
+            self._group_counts[group] = self._group_counts.get(group, 0) + 1
+            self._group_pnl[group] = self._group_pnl.get(group, 0.0) + pnl
+
+    @classmethod
+    def from_frame(cls, df, schema=BACKTEST_SCHEMA, group_col="trigger_type", starting_capital=0.0):
+        ledger = cls(schema, group_col, starting_capital, capacity=len(df))
+        n = len(df)
+        if n == 0:
+            return ledger
+
+        for name, kind in schema.items():
+            if name not in df.columns:
+                continue
+            column = df[name]
+            if kind == "category":
+                values = column.astype(object).where(column.notna(), None)
+                categories = pd.Categorical(values)
+                ledger._labels[name] = list(categories.categories)
+                ledger._codes[name] = {label: code for code, label in enumerate(ledger._labels[name])}
+                ledger._columns[name][:n] = categories.codes
+            elif kind.startswith("datetime64"):
+                ledger._columns[name][:n] = pd.to_datetime(column, errors="coerce").to_numpy(kind)
+            elif kind == "object":
+                ledger._columns[name][:n] = column.to_numpy(dtype=object)
+            else:
+                ledger._columns[name][:n] = column.fillna(0).to_numpy(dtype=kind)
+        ledger._size = n
+
+        pnl = ledger._columns["pnl"][:n]
+        ledger._net_pnl = float(pnl.sum())
+        ledger._hold_sum = int(ledger._columns["holding_days"][:n].sum())
+        ledger.running_capital = float(starting_capital) + ledger._net_pnl
+        if group_col in ledger._labels:
+            codes = ledger._columns[group_col][:n]
+            present = codes >= 0
+            counts = np.bincount(codes[present], minlength=len(ledger._labels[group_col]))
+            sums = np.bincount(codes[present], weights=pnl[present], minlength=len(ledger._labels[group_col]))
+            for code, label in enumerate(ledger._labels[group_col]):
+                if counts[code]:
+                    ledger._group_counts[label] = int(counts[code])
+                    ledger._group_pnl[label] = float(sums[code])
+        return ledger
+
+    # Aggregates
+    @property
+    def net_pnl(self):
+        return self._net_pnl
+
+    @property
+    def avg_hold(self):
+        return self._hold_sum / self._size if self._size else None
+
+    @property
+    def final_capital(self):
+        if "capital" in self.schema and self._size:
+            return float(self._columns["capital"][self._size - 1])
+        return self.running_capital
+
+    def last(self, name):
+        if not self._size:
+            return None
+        value = self._columns[name][self._size - 1]
+        if self.schema[name] == "category":
+            return self._labels[name][value] if value >= 0 else None
+        return value
+
+    def group_counts(self):
+        return dict(self._group_counts)
+
+    def group_pnl(self):
+        return dict(self._group_pnl)
+
+    def summary(self):
+        return {
+            "trades": self._size,
+            "total_pnl": round(self._net_pnl, 2),
+            "avg_hold": round(self.avg_hold, 2) if self._size else 0,
+        }
+
+    # Conversions share the underlying buffers rather than copying them
+    def column(self, name):
+        return self._columns[name][:self._size]
+
+    def to_pandas(self):
+        data = {}
+        for name, kind in self.schema.items():
+            values = self.column(name)
+            if kind == "category":
+                values = pd.Categorical.from_codes(values, categories=self._labels[name])
+            data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        arrays = {}
+        for name, kind in self.schema.items():
+            values = self.column(name)
+            if kind == "category":
+                codes = pa.array(values, mask=values < 0)
+                arrays[name] = pa.DictionaryArray.from_arrays(codes, pa.array(self._labels[name], type=pa.string()))
+            elif kind == "object":
+                arrays[name] = pa.array(values.tolist(), type=pa.string())
+            else:
+                arrays[name] = pa.array(values)
+        return pa.table(arrays)
@@ -1,13 +1,15 @@
+import numpy as np
 import pandas as pd
 from sentiment_engine import fetch_articles
-from config import THRESHOLDS
+from config import THRESHOLDS, VOLATILITY_EXIT
+from trade_ledger import TradeLedger, DASHBOARD_SCHEMA
 
-def generate_trades(symbol, company_name, price_df):
+def generate_ledger(symbol, company_name, price_df):
+    trades = TradeLedger(DASHBOARD_SCHEMA, group_col="final_signal", capacity=max(len(price_df) // 2, 1))
     if price_df.empty:
-        return pd.DataFrame()
+        return trades
 
     dates = price_df.index.tolist()
-    trades = []
     i = 0
     while i < len(dates) - 1:
         entry_date = dates[i]
@@ -21,7 +23,7 @@ def generate_trades(symbol, company_name, price_df):
             momentum_score = (exit_price - entry_price) / entry_price
 
             # Volatility exit: price moves > 2%
-            if abs(momentum_score) >= 0.02:
+            if abs(momentum_score) >= VOLATILITY_EXIT:
                 break
 
             # Signal exit: sentiment flips or momentum reverses
@@ -55,26 +57,137 @@ def generate_trades(symbol, company_name, price_df):
 
         print(f"[DEBUG] {symbol} | {entry_date.date()} → {final_signal} | Momentum: {momentum_pct}% | Sentiment: {sentiment_pct}% | Reason: {reason}")
 
-        trades.append({
-            "symbol": symbol,
-            "entry_date": entry_date,
-            "exit_date": exit_date,
-            "entry_price": entry_price,
-            "exit_price": exit_price,
-            "quantity": quantity,
-            "capital": capital,
-            "pnl": pnl,
-            "holding_days": holding_days,
-            "momentum_score": momentum_pct,
-            "sentiment_score": sentiment_pct,
-            "final_signal": final_signal,
-            "article_title": article_title,
-            "article_url": article_url,
-            "reason": reason
-        })
+        if final_signal != "HOLD":
+            trades.append(
+                symbol=symbol,
+                entry_date=entry_date,
+                exit_date=exit_date,
+                entry_price=entry_price,
+                exit_price=exit_price,
+                quantity=quantity,
+                capital=capital,
+                pnl=pnl,
+                holding_days=holding_days,
+                momentum_score=momentum_pct,
+                sentiment_score=sentiment_pct,
+                final_signal=final_signal,
+                article_title=article_title,
+                article_url=article_url,
+                reason=reason
+            )
 
         i = exit_index + 1
 
-    df = pd.DataFrame(trades)
-    return df[df["final_signal"].isin(["BUY", "SELL"])]
+    return trades
+
+def generate_trades(symbol, company_name, price_df):
+    return generate_ledger(symbol, company_name, price_df).to_pandas()
+
+
+def build_entry_index(symbol, price_df):
+    """Precompute per-entry momentum records, signal exits and sentiment so thresholds can be replayed without I/O."""
+    n = len(price_df)
+    dates = pd.DatetimeIndex(price_df.index)
+    # yfinance may return single-ticker columns as (n, 1) frames
+    opens = np.asarray(price_df["open"], dtype=np.float64)
+    closes = np.asarray(price_df["close"], dtype=np.float64)
+    opens, closes = (a[:, 0] if a.ndim == 2 else a for a in (opens, closes))
+
+    # Sentiment is fetched once per possible entry date (the last date can't open a trade)
+    articles = [fetch_articles(symbol, date) for date in dates[:-1]]
+    articles += [(0.0, "", "")] if n else []
+    sentiment = np.array([a[0] for a in articles], dtype=np.float64)
+
+    # Per entry i, keep only the days where |momentum| sets a new high before the signal exit.
+    # The first day |momentum| reaches any volatility threshold is always one of these records,
+    # so one row at a time yields a few values per entry instead of an n x n matrix
+    signal_exit = np.full(n, n, dtype=np.int64)
+    record_levels, record_days = [], []
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    for i in range(n - 1):
+        momentum = (closes[i + 1:] - opens[i]) / opens[i]
+
+        # Signal exits don't depend on any slider: sentiment opposes the momentum direction
+        if sentiment[i] != 0:
+            signal = momentum > 0 if sentiment[i] < 0 else momentum < 0
+            first = int(signal.argmax())
+            if signal[first]:
+                signal_exit[i] = i + 1 + first
+
+        running_max = np.maximum.accumulate(np.abs(momentum[:signal_exit[i] - i - 1]))
+        is_record = np.empty(len(running_max), dtype=bool)
+        is_record[:1] = True
+        np.greater(running_max[1:], running_max[:-1], out=is_record[1:])
+        days = np.flatnonzero(is_record)
+        record_levels.append(running_max[days])
+        record_days.append(i + 1 + days)
+        offsets[i + 1] = offsets[i] + len(days)
+    offsets[n:] = offsets[n - 1] if n else 0  # the last date opens no trade
+
+    return {
+        "symbol": symbol,
+        "dates": dates,
+        "opens": opens,
+        "closes": closes,
+        "sentiment": sentiment,
+        "article_titles": np.array([a[1] for a in articles], dtype=object),
+        "article_urls": np.array([a[2] for a in articles], dtype=object),
+        "record_levels": np.concatenate(record_levels) if record_levels else np.zeros(0),
+        "record_days": np.concatenate(record_days) if record_days else np.zeros(0, dtype=np.int64),
+        "record_offsets": offsets,
+        "signal_exit": signal_exit,
+    }
+
+def simulate_from_index(index, thresholds=THRESHOLDS, volatility_exit=VOLATILITY_EXIT):
+    n = len(index["dates"])
+    if n < 2:
+        return TradeLedger(DASHBOARD_SCHEMA, group_col="final_signal", capacity=1)
+
+    # Records are increasing within each entry, so the count below the threshold points at the
+    # first record that reaches it; entries with no such record exit on their signal
+    offsets = index["record_offsets"]
+    below = np.concatenate(([0], np.cumsum(index["record_levels"] < volatility_exit)))
+    first_hit = offsets[:-1] + below[offsets[1:]] - below[offsets[:-1]]
+    hit = first_hit < offsets[1:]
+    exits = index["signal_exit"].copy()
+    exits[hit] = index["record_days"][first_hit[hit]]
+
+    entries, outs = [], []
+    i = 0
+    while i < n - 1:
+        exit_index = exits[i]
+        if exit_index >= n:
+            break  # same as generate_ledger: no exit before the data ends
+        entries.append(i)
+        outs.append(exit_index)
+        i = exit_index + 1
+
+    entries, outs = np.array(entries, dtype=int), np.array(outs, dtype=int)
+    entry_price = index["opens"][entries]
+    exit_price = index["closes"][outs]
+    momentum = (exit_price - entry_price) / entry_price
+    sentiment = index["sentiment"][entries]
+
+    buy = (momentum > thresholds["momentum_buy"]) & (sentiment >= thresholds["sentiment_buy"])
+    sell = ~buy & (momentum < thresholds["momentum_sell"]) & (sentiment <= thresholds["sentiment_sell"])
+    keep = buy | sell
 
+    dates = index["dates"]
+    trades = pd.DataFrame({
+        "symbol": index["symbol"],
+        "entry_date": dates[entries[keep]],
+        "exit_date": dates[outs[keep]],
+        "entry_price": entry_price[keep],
+        "exit_price": exit_price[keep],
+        "quantity": 1,
+        "capital": entry_price[keep],
+        "pnl": (exit_price - entry_price)[keep],
+        "holding_days": (dates[outs[keep]] - dates[entries[keep]]).days,
+        "momentum_score": np.round(momentum[keep] * 100, 2),
+        "sentiment_score": np.round(sentiment[keep] * 100, 2),
+        "final_signal": np.where(buy[keep], "BUY", "SELL"),
+        "article_title": index["article_titles"][entries[keep]],
+        "article_url": index["article_urls"][entries[keep]],
+        "reason": "Signal passed",
+    })
+    return TradeLedger.from_frame(trades, DASHBOARD_SCHEMA, group_col="final_signal")
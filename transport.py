@@ -0,0 +1,122 @@
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import requests
+import hashlib
+import base64
+import gzip
+import json
+import os
+
+# HTTP_MODE: "live" (default) goes straight to the network, "record" fetches and stores
+# every response, "replay" serves stored responses and never touches the network.
+HTTP_MODES = ("live", "record", "replay")
+HTTP_MODE = os.getenv("HTTP_MODE", "live")
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache"))
+
+# Credentials are dropped from cache keys and stored URLs
+SECRET_PARAMS = {"token", "apikey", "api_key"}
+VALIDATOR_HEADERS = ["ETag", "Last-Modified", "Content-Type"]
+
+class ReplayMiss(LookupError):
+    pass
+
+class RecordedResponse:
+    def __init__(self, status_code, headers, content, url=""):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+def normalize_request(method, url, params=None):
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True) + list((params or {}).items())
+    query = sorted((k, str(v)) for k, v in query if k.lower() not in SECRET_PARAMS)
+    return f"{method.upper()} {parts.scheme.lower()}://{parts.netloc.lower()}{parts.path}?{urlencode(query)}"
+
+def _resolve_mode(mode):
+    mode = mode or HTTP_MODE
+    if mode not in HTTP_MODES:
+        # A typo must not silently fall through to record (network calls plus cache writes)
+        raise ValueError(f"Unknown HTTP_MODE {mode!r}; expected one of {', '.join(HTTP_MODES)}")
+    return mode
+
+def _path(namespace, key, suffix):
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, namespace, digest[:2], f"{digest}{suffix}")
+
+def _load(path):
+    with gzip.open(path, "rt") as f:
+        entry = json.load(f)
+    return RecordedResponse(entry["status"], entry["headers"], base64.b64decode(entry["body"]), entry["request"])
+
+def _store(path, request_key, response):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    entry = {
+        "request": request_key,
+        "status": response.status_code,
+        "headers": {h: response.headers[h] for h in VALIDATOR_HEADERS if h in response.headers},
+        "body": base64.b64encode(response.content).decode(),
+    }
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt") as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, path)
+
+def get(url, params=None, timeout=10, mode=None):
+    mode = _resolve_mode(mode)
+    if mode == "live":
+        return requests.get(url, params=params, timeout=timeout)
+
+    request_key = normalize_request("GET", url, params)
+    path = _path("http", request_key, ".json.gz")
+    if mode == "replay":
+        if not os.path.exists(path):
+            raise ReplayMiss(f"No recording for {request_key}")
+        return _load(path)
+
+    # Record: revalidate an existing recording when the server gave us validators
+    headers = {}
+    previous = _load(path) if os.path.exists(path) else None
+    if previous is not None:
+        if "ETag" in previous.headers:
+            headers["If-None-Match"] = previous.headers["ETag"]
+        if "Last-Modified" in previous.headers:
+            headers["If-Modified-Since"] = previous.headers["Last-Modified"]
+
+    response = requests.get(url, params=params, timeout=timeout, headers=headers)
+    if response.status_code == 304 and previous is not None:
+        return previous
+    if response.status_code == 200:
+        _store(path, request_key, response)
+    return response
+
+def cached_call(namespace, key_parts, fetch, mode=None):
+    """Record/replay for clients that don't expose their HTTP layer (e.g. yfinance): stores the parsed DataFrame."""
+    # Parquet, not pickle: loading a recording must never run code, and must not depend on the
+    # pandas version; the pandas metadata restores the index and any column MultiIndex
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    mode = _resolve_mode(mode)
+    if mode == "live":
+        return fetch()
+
+    request_key = json.dumps(key_parts, sort_keys=True, default=str)
+    path = _path(namespace, request_key, ".parquet")
+    if mode == "replay":
+        if not os.path.exists(path):
+            raise ReplayMiss(f"No {namespace} recording for {request_key}")
+        return pq.read_table(path).to_pandas()
+
+    df = fetch()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(pa.Table.from_pandas(df), tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return df